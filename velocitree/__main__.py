@@ -9,12 +9,22 @@ velocitree fit --tree ... --model 'all'
 
 """
 
+from enum import Enum
 from pathlib import Path
 import typer
 from velocitree import __version__
-from velocitree.speciation.regression import Models
-from velocitree.speciation.generative import RandomTree, UserTree
-from velocitree.speciation.viz import heatmap_tree_plot
+
+# NOTE: the scientific stack (numpy, pandas, toytree, toyplot, ...) is
+# imported inside each command so that --help and --version are fast.
+
+
+class Models(str, Enum):
+    "Mirror of velocitree.speciation.regression.Models (avoids numpy import)"
+    linear = "linear"
+    exponential = "exponential"
+    quadratic = "quadratic"
+    logarithmic = "logarithmic"
+    asymptotic = "asymptotic"
 
 
 CONTEXT_SETTINGS = dict(help_option_names=["-h", "--help"])
@@ -55,6 +65,7 @@ def draw(
     ):
     """Generates plots of observed hybrids/RI given a phylogeny.
     """
+    from velocitree.speciation.viz import dist_RI_scatterplot, heatmap_tree_plot
     typer.secho("Generating plots", fg=typer.colors.MAGENTA)
     dist_RI_scatterplot(subsample)
     heatmap_tree_plot(data.tree, data.clades, subsample)
@@ -74,6 +85,8 @@ def generate(
     Generate a test crossing dataset on an input tree or on a random 
     birth-death tree for performing power analyses.
     """
+    from velocitree.speciation.generative import RandomTree, UserTree
+
     if tree:
         typer.secho(
             "Generating a test data set on user input tree", 
@@ -85,8 +98,12 @@ def generate(
             "Generating {ncrosses} observations on a {ntips} tip b-d tree", 
             fg=typer.colors.MAGENTA,
         )
-        tool = RandomTree(ntips, nclades, model, seed)
+        tool = RandomTree(ntips, nclades, model.value, seed)
         for param in tool.params:
             print("{}: {}".format(param, tool.params[param]))
         print(tool.spdata.head())
         print(tool.sample_observations(ncrosses).head())
+
+
+if __name__ == "__main__":
+    app()
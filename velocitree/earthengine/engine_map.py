@@ -4,31 +4,62 @@
 Subclass folium Map to enable earthengine rasters
 """
 
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 import ee
 import folium
 
 
+@lru_cache(maxsize=128)
+def _get_tile_url(image_json, vis_params_json):
+    """
+    Returns the tile URL format for an EE image serialized as JSON.
+    Cached so that re-adding the same image and vis_params does not
+    repeat the getMapId request to Earth Engine.
+    """
+    image = ee.Image(ee.deserializer.fromJSON(image_json))
+    map_id_dict = image.getMapId(json.loads(vis_params_json))
+    return map_id_dict['tile_fetcher'].url_format
+
+
 class EngineMap(folium.Map):
     """
     Subclass of folium Map for adding EE images. Here
     self is a folium.Map class instance, and we are adding 
     additional functions to this class type.
     """
-    
+    # shared by all maps to fetch EE data off the main thread
+    _executor = ThreadPoolExecutor(max_workers=4)
+
     def __init__(self, location=None, zoom_start=None, **kwargs):
         # inherit from parent class
         super().__init__(location=location, zoom_start=zoom_start, **kwargs)
     
     
+    def fetch_ee_vector(self, feature):
+        """
+        Start fetching the geometry of a google earth engine vector 
+        feature on a background thread and return a Future of its 
+        GeoJSON data. Pass the Future to add_ee_vector() to add the 
+        layer to the map in the order of that call.
+        """
+        return self._executor.submit(feature.geometry().getInfo)
+    
+    
     def add_ee_vector(self, feature, **kwargs):
         """
-        Add a google earth engine vector feature to a folium map.
+        Add a google earth engine vector feature to a folium map. The
+        feature can also be a Future returned by fetch_ee_vector().
         """
+        # get GeoJSON data, or wait for a fetch that is in progress
+        if isinstance(feature, Future):
+            data = feature.result()
+        else:
+            data = feature.geometry().getInfo()
+
         # create vector feature
-        feature = folium.GeoJson(
-            data=feature.geometry().getInfo(),
-            **kwargs,
-        )
+        feature = folium.GeoJson(data=data, **kwargs)
         
         # add vector to Map and return self to allow chaining
         self.add_child(feature)
@@ -46,11 +77,11 @@ class EngineMap(folium.Map):
         if isinstance(image, ee.ImageCollection):
             image = image.mosaic()
 
-        # get the JSON instructions to show image tiles
-        map_id_dict = image.getMapId(vis_params)
-        
-        # get url of the raster tiles
-        tiles = map_id_dict['tile_fetcher'].url_format
+        # get url of the raster tiles (cached by image and vis_params)
+        tiles = _get_tile_url(
+            image.serialize(), 
+            json.dumps(vis_params, sort_keys=True),
+        )
         
         # create a folium raster layer and add to self
         raster = folium.raster_layers.TileLayer(
@@ -6,25 +6,39 @@
 - https://developers.google.com/earth-engine/apidocs/ee-classifier-amnhmaxent#colab-python
 """
 
+from functools import cached_property
 import ee
 # from engine_map import EngineMap
 
 
-# make user login 
-ee.Authenticate()
-ee.Initialize()
+def _ensure_ee():
+    """
+    Authenticate and initialize earthengine on first use, rather than
+    at import, so that this module can be imported offline.
+    """
+    # is_initialized() is only available in newer versions of ee
+    if hasattr(ee.data, "is_initialized"):
+        initialized = ee.data.is_initialized()
+    else:
+        initialized = getattr(ee.data, "_credentials", None) is not None
+    if not initialized:
+        # make user login 
+        ee.Authenticate()
+        ee.Initialize()
 
 
 class SpeciesDistributionModel:
     def __init__(self, species):
         self.species = species
+        _ensure_ee()
 
     def get_filtered_sproc_points(self):
         pass
 
-    def sample_training_data(self):
-        # Create some sample species presence/absence training data.
-        training_data = ee.FeatureCollection([
+    @cached_property
+    def training_data(self):
+        "Create some sample species presence/absence training data."
+        return ee.FeatureCollection([
             # Species present points.
             ee.Feature(ee.Geometry.Point([-122.39567, 38.02740]), {'presence': 1}),
             ee.Feature(ee.Geometry.Point([-122.68560, 37.83690]), {'presence': 1}),
@@ -36,27 +50,35 @@ class SpeciesDistributionModel:
             ee.Feature(ee.Geometry.Point([-122.03010, 37.66660]), {'presence': 0})
         ])
 
-    # Import a Landsat 8 image and select the reflectance bands.
-    image = (
-        ee.Image('LANDSAT/LC08/C01/T1_SR/LC08_044034_20200606')
-        .select(['B[0-9]*'])
-    )
-
-    # Sample the image at the location of the points.
-    training = image.sampleRegions(**{
-        'collection': training_data,
-        'scale': 30
-    })
-
-    # Define and train a Maxent classifier from the image-sampled points.
-    classifier = ee.Classifier.amnhMaxent().train(**{
-        'features': training,
-        'classProperty': 'presence',
-        'inputProperties': image.bandNames()
-    })
-
-    # Classify the image using the Maxent classifier.
-    image_classified = image.classify(classifier)    
+    @cached_property
+    def image(self):
+        "Import a Landsat 8 image and select the reflectance bands."
+        return (
+            ee.Image('LANDSAT/LC08/C01/T1_SR/LC08_044034_20200606')
+            .select(['B[0-9]*'])
+        )
+
+    @cached_property
+    def training(self):
+        "Sample the image at the location of the points."
+        return self.image.sampleRegions(**{
+            'collection': self.training_data,
+            'scale': 30
+        })
+
+    @cached_property
+    def classifier(self):
+        "Define and train a Maxent classifier from the image-sampled points."
+        return ee.Classifier.amnhMaxent().train(**{
+            'features': self.training,
+            'classProperty': 'presence',
+            'inputProperties': self.image.bandNames()
+        })
+
+    @cached_property
+    def image_classified(self):
+        "Classify the image using the Maxent classifier."
+        return self.image.classify(self.classifier)
 
 
 
@@ -5,8 +5,9 @@ Generate data under a regression model with known parameters
 for validating model setup and performing power analyses.
 """
 
-from typing import List, Optional
-import itertools
+from typing import Dict, List, Optional
+from functools import lru_cache
+import heapq
 import toytree
 import numpy as np
 import pandas as pd
@@ -17,7 +18,7 @@ from velocitree.speciation.regression import (
     linea_f, expon_f, quadr_f, logar_f, asymp_f
 )
 # import toyplot
-# import pymc3 as pm
+# import pymc as pm
 
 
 class GenerativeBase:
@@ -31,8 +32,10 @@ class GenerativeBase:
         self.clade_idxs: List[int] = clade_idxs
         self.function = MODEL_DICT[model]
 
-        # attrs to fill (type hints)
-        self.ridata: pd.DataFrame = None
+        # attrs to fill (type hints). Crosses data are stored as columns
+        # of arrays and only converted to a DataFrame for the user.
+        self._cols: Dict[str, np.ndarray] = {}
+        self._ridata: Optional[pd.DataFrame] = None
         self.subdata: pd.DataFrame = None
         self.group_sizes: dict = {}
         self.groups: list = []
@@ -45,6 +48,18 @@ class GenerativeBase:
         self.get_velocities()
         self.get_logit()
 
+    @property
+    def ridata(self) -> pd.DataFrame:
+        "DataFrame view of the crosses data columns, built on first access."
+        if self._ridata is None:
+            self._ridata = pd.DataFrame(self._cols, copy=False)
+        return self._ridata
+
+    def _set_column(self, name: str, values: np.ndarray):
+        "Store a crosses data column and reset the cached DataFrame."
+        self._cols[name] = values
+        self._ridata = None
+
     def get_groups(self):
         """
         Expand clade_idxs to the tip idxs
@@ -60,20 +75,20 @@ class GenerativeBase:
 
     def get_crosses(self):
         """
-        Get a dataframe of all possible pairs and a subsampled one 
+        Get data columns of all possible pairs and a subsampled one 
         representing a set of observations.
         """
-        # get all combinations of two tips
-        tipsa, tipsb = zip(*itertools.combinations(range(self.tree.ntips), 2))
-
-        # get tip idxs and genetic distances between them
-        self.ridata = pd.DataFrame({
-            "sidx0": tipsa,
-            "sidx1": tipsb,
-            "dist": [
-                get_dist(self.tree, i, j) / 2. for (i, j) in zip(tipsa, tipsb)
-            ],
-        })
+        # get tip idxs of all pairs of tips, including each tip with 
+        # itself (RI=0 within-species), already sorted by (sidx0, sidx1),
+        # and the genetic distance between them from a distance matrix
+        # (whose diagonal is exactly 0).
+        tipsa, tipsb = np.triu_indices(self.tree.ntips, k=0)
+        dist = get_tip_distance_matrix(self.tree)[tipsa, tipsb]
+        dist /= 2.
+        self._cols = {}
+        self._set_column("sidx0", tipsa)
+        self._set_column("sidx1", tipsb)
+        self._set_column("dist", dist)
 
     def get_true_param_dists(self, random=False):
         """
@@ -81,13 +96,10 @@ class GenerativeBase:
         be generated.
         """
         if random:
+            nclades = len(self.clade_idxs)
             self.params['𝛽'] = self.rng.uniform(3, 5)
-            self.params['𝜓_means'] = [
-                self.rng.uniform(0, 2) for i in self.clade_idxs
-            ]
-            self.params['𝜓_stds'] = [
-                abs(self.rng.normal(0, 1)) for i in self.clade_idxs
-            ]
+            self.params['𝜓_means'] = self.rng.uniform(0, 2, size=nclades)
+            self.params['𝜓_stds'] = np.abs(self.rng.normal(0, 1, size=nclades))
         else:
             self.params['𝛽'] = 10
             self.params['𝜓_means'] = np.linspace(-0.5, 0.5, len(self.clade_idxs))
@@ -99,12 +111,11 @@ class GenerativeBase:
         distribution that describes them. This function varies in 
         the different model classes (pooled, unpooled, partpooled).
         """
+        means = np.asarray(self.params['𝜓_means'])[self.groups]
+        stds = np.asarray(self.params['𝜓_stds'])[self.groups]
         self.spdata = pd.DataFrame({
             "gidx": self.groups,
-            "𝜓": self.rng.normal(
-                [self.params['𝜓_means'][i] for i in self.groups],
-                [self.params['𝜓_stds'][i] for i in self.groups], 
-            )
+            "𝜓": self.rng.normal(means, stds),
         })
 
     def get_velocities(self):
@@ -112,32 +123,18 @@ class GenerativeBase:
         Generate velocities of observed species crosses to use for 
         generating test data.
         """
-        # add RI=0 for all within-species comparisons
-        nulls = pd.DataFrame({
-            'sidx0': range(self.tree.ntips),
-            'sidx1': range(self.tree.ntips),
-            'dist': 0.,
-        })
-        self.ridata = pd.concat([self.ridata, nulls], ignore_index=True)
-
-        # sort RI by species indices
-        self.ridata = (
-            self.ridata
-                .sort_values(by=['sidx0', 'sidx1'])
-                .reset_index(drop=True)
-            )
-
         # get normalized dists (dists will be approx -2 to 2, instead of 0-1).
-        self.ridata["distnorm"] = (
-            (self.ridata.dist - self.ridata.dist.mean()) / self.ridata.dist.mean())       
-
-        # compute joint velocities
-        self.ridata['joint_velo'] = (
-            self.rng.normal(
-                self.params['𝛽'] + 
-                self.spdata['𝜓'][self.ridata.sidx0].values +
-                self.spdata['𝜓'][self.ridata.sidx1].values
-        ))
+        dist = self._cols["dist"]
+        self._set_column("distnorm", (dist - dist.mean()) / dist.mean())
+
+        # compute joint velocities (one draw per pair of species)
+        psi = self.spdata['𝜓'].to_numpy()
+        mean = (
+            self.params['𝛽'] +
+            np.take(psi, self._cols["sidx0"]) +
+            np.take(psi, self._cols["sidx1"])
+        )
+        self._set_column("joint_velo", self.rng.normal(mean, 1.0))
 
     def get_logit(self):
         """
@@ -147,25 +144,28 @@ class GenerativeBase:
         regressors are: "linear", "logarithmic", "asymptotic", 
         "exponential" and "quadratic".
         """
-        # add log-odds of hybridizing
+        # add log-odds of hybridizing (evaluated on arrays, not Series)
         values = self.function(
-            velocity=self.ridata.joint_velo,
-            distance=self.ridata.dist,            
-            # distance=self.ridata.distnorm,
+            velocity=self._cols["joint_velo"],
+            distance=self._cols["dist"],
+            # distance=self._cols["distnorm"],
         )
-        # try more normalizations
-        values = values - values.mean() / values.std()
-        self.ridata['expit'] = scipy.special.expit(values)
+        # standardize the log-odds and convert to probabilities in place
+        values -= values.mean()
+        values /= values.std(ddof=1)
+        self._set_column("expit", scipy.special.expit(values, out=values))
 
     def sample_observations(self, nsamples=None):
         """
         Randomly sample a set of observations with RI values sampled
         from the expit probabilities.
         """
-        self.ridata["RI"] = np.random.binomial(1, self.ridata['expit'])
+        probs = self._cols["expit"]
+        self._set_column("RI", self.rng.binomial(1, probs).astype(np.int8))
         if nsamples:
-            return self.ridata.sample(nsamples).reset_index(drop=True).copy()
-        return self.ridata.copy()
+            idxs = self.rng.choice(probs.size, nsamples, replace=False)
+            return pd.DataFrame({i: j[idxs] for (i, j) in self._cols.items()})
+        return pd.DataFrame(self._cols)
 
 
 class UserTree(GenerativeBase):
@@ -209,32 +209,106 @@ class RandomTree(GenerativeBase):
         """
         Get objects for indexing individuals in groups/clades.
         """
-        # generate group assignments. 
-        node = self.tree.treenode
-        self.clade_idxs = [node.idx]
+        # cache the number of children and of tips in each clade
+        nchildren = {i: len(j.children) for (i, j) in self.tree.idx_dict.items()}
+        parents, _ = get_parent_arrays(self.tree)
+        ntips = np.zeros(self.tree.nnodes, dtype=int)
+        ntips[:self.tree.ntips] = 1
+        for idx in range(self.tree.nnodes - 1):
+            ntips[parents[idx]] += ntips[idx]
+
+        # generate group assignments by splitting clades starting from 
+        # the root, popping the clade with the most children (then the
+        # most tips) from a heap each time.
+        root = self.tree.treenode.idx
+        heap = [(-nchildren[root], -ntips[root], root)]
         for _ in range(2, self.nclades + 1):
-            sidxs = sorted(
-                self.clade_idxs, 
-                key=lambda x: len(self.tree.idx_dict[x].children)
-            )
-            nidx = sidxs[0]
-            self.clade_idxs.remove(nidx)
-            self.clade_idxs.extend([
-                i.idx for i in self.tree.idx_dict[nidx].children
-            ])
+            nidx = heapq.heappop(heap)[-1]
+            for child in self.tree.idx_dict[nidx].children:
+                cidx = child.idx
+                heapq.heappush(heap, (-nchildren[cidx], -ntips[cidx], cidx))
+
+        # order clades by tip idx to match the order of groups
+        self.clade_idxs = sorted(
+            (i[-1] for i in heap),
+            key=lambda x: min(j.idx for j in self.tree.idx_dict[x].get_leaves()),
+        )
 
 
 
-def get_dist(tree, idx0, idx1):
+def get_tip_distance_matrix(tree):
+    """
+    Returns an (ntips, ntips) array of genetic distances between tips.
+    Results for the two most recent trees are cached by their parent 
+    idxs and branch lengths, so repeated calls on the same tree (e.g., 
+    across power analyses) are not recomputed. The returned array is 
+    read-only. Use clear_tip_distance_cache() to free the cache.
+    """
+    parents, blens = get_parent_arrays(tree)
+    return _get_tip_distance_matrix(
+        tree.ntips, parents.tobytes(), blens.tobytes())
+
+
+def clear_tip_distance_cache():
+    """
+    Frees the cached tip distance matrices (the most recent two trees).
+    """
+    _get_tip_distance_matrix.cache_clear()
+
+
+@lru_cache(maxsize=2)
+def _get_tip_distance_matrix(ntips, parents_bytes, blens_bytes):
+    """
+    Computes the tip distance matrix from the flat parent and branch
+    length arrays of a tree. Each pair of tips is filled once, in the 
+    block of pairs whose most recent common ancestor is the node being
+    visited: d(i, j) = depth(i) + depth(j) - 2 * depth(mrca).
+    """
+    parents = np.frombuffer(parents_bytes, dtype=np.int64)
+    blens = np.frombuffer(blens_bytes, dtype=np.float64)
+    nnodes = parents.size
+
+    # root-to-node depths, visiting parents (higher idx) before children
+    depths = np.zeros(nnodes)
+    for idx in range(nnodes - 2, -1, -1):
+        depths[idx] = depths[parents[idx]] + blens[idx]
+
+    # children of each node
+    children = [[] for _ in range(nnodes)]
+    for idx in range(nnodes - 1):
+        children[parents[idx]].append(idx)
+
+    # children always have lower idxs than their parents in toytree, so
+    # a single pass in idx order visits each clade before its parent.
+    tips = {i: np.array([i]) for i in range(ntips)}
+    dists = np.zeros((ntips, ntips))
+    for idx in range(ntips, nnodes):
+        clades = [tips.pop(i) for i in children[idx]]
+        for (cidx, tips0) in enumerate(clades):
+            for tips1 in clades[cidx + 1:]:
+                block = (
+                    depths[tips0][:, None] + depths[tips1][None, :] 
+                    - 2 * depths[idx]
+                )
+                dists[np.ix_(tips0, tips1)] = block
+                dists[np.ix_(tips1, tips0)] = block.T
+        tips[idx] = np.concatenate(clades)
+    dists.flags.writeable = False
+    return dists
+
+
+def get_parent_arrays(tree):
     """
-    TODO: use toytree func.; 
-    Returns the genetic distance between two nodes on a tree.
+    Returns flat arrays of the parent idx (-1 for the root) and the 
+    branch length (0 for the root) of every node, ordered by node idx.
     """
-    dist = tree.treenode.get_distance(
-        tree.idx_dict[idx0], 
-        tree.idx_dict[idx1],
-    )
-    return dist
+    parents = np.full(tree.nnodes, -1, dtype=np.int64)
+    blens = np.zeros(tree.nnodes)
+    for idx, node in tree.idx_dict.items():
+        if not node.is_root():
+            parents[idx] = node.up.idx
+            blens[idx] = node.dist
+    return parents, blens
 
 
 
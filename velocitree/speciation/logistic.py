@@ -5,9 +5,11 @@
 https://www.statforbiology.com/nonlinearregression/usefulequations#asymptotic_regression_model
 """
 
+import importlib.util
 import pandas as pd
 import toytree
-import pymc3 as pm
+import arviz as az
+import pymc as pm
 from velocitree.speciation.regression import linea_f, expon_f, quadr_f, logar_f, asymp_f
 
 SPCOLUMNS = ["hybridizes", "speciesA", "speciesB"]
@@ -32,13 +34,15 @@ class BaseLogisticModel:
         # to be filled by a subclass 
         self.model = pm.Model()
 
-        # default mcmcparams
+        # default mcmcparams (use the JAX numpyro sampler if installed)
         self.sample_kwargs = dict(
             tune=2000,
             draws=2000,
             target_accept=0.95,
-            return_inferencedata=False,
             progressbar=True,
+            nuts_sampler=(
+                "numpyro" if importlib.util.find_spec("numpyro") else "pymc"
+            ),
         )
 
         # select the regression model
@@ -69,6 +73,38 @@ class BaseLogisticModel:
         # check ridata for names in tree.
 
 
+    def get_model_data(self):
+        """
+        Returns a dict of values for the pm.Data variables of a model.
+        These are the only parts of a model that differ between datasets
+        with the same model type, function, ntips and nclades.
+        """
+        return {
+            "spp_idx0": self.ridata.sidx0.values,
+            "spp_idx1": self.ridata.sidx1.values,
+            "gidx": self.spdata.gidx.values,
+            "distnorm": self.ridata.distnorm.values,
+            "RI": self.ridata.RI.values,
+        }
+
+
+    def update_data(self, ridata, spdata=None):
+        """
+        Replace the observed data of the existing model with pm.set_data,
+        so that the same model can be refit to new datasets (e.g., in 
+        power analyses) without rebuilding it.
+        """
+        self.ridata = ridata
+        if spdata is not None:
+            self.spdata = spdata
+        data = self.get_model_data()
+        with self.model:
+            pm.set_data({
+                i: j for (i, j) in data.items() 
+                if i in self.model.named_vars
+            })
+
+
     def sample(self, **kwargs):
         """
         Run MCMC sampler
@@ -77,13 +113,10 @@ class BaseLogisticModel:
 
         # sample posterior, skip burnin
         with self.model:
-            trace = pm.sample(**self.sample_kwargs)[1000:]
-            stats = pm.summary(trace)
-            path = pm.save_trace(
-                trace, 
-                directory=f"velocitree_trace_{self.model_type}", 
-                overwrite=True,
-            )
+            trace = pm.sample(**self.sample_kwargs)
+        trace = trace.sel(draw=slice(1000, None))
+        stats = az.summary(trace)
+        path = trace.to_netcdf(f"velocitree_trace_{self.model_type}.nc")
         print(f'trace save to {path}')
         print(stats)        
 
@@ -5,8 +5,8 @@ Subclass of BaseLogisticModel to fit a POOLED
 hierarchical regression model.
 """
 
-import pymc3 as pm
-from logistic import BaseLogisticModel
+import pymc as pm
+from velocitree.speciation.logistic import BaseLogisticModel
 
 
 class LogisticPooled(BaseLogisticModel):
@@ -20,9 +20,11 @@ class LogisticPooled(BaseLogisticModel):
         Setup a logistic regression model.        
         """
         with self.model:
-            # indexers
+            # indexers and data
             sidx0 = pm.Data("spp_idx0", self.ridata.sidx0.values)
             sidx1 = pm.Data("spp_idx1", self.ridata.sidx1.values)
+            distnorm = pm.Data("distnorm", self.ridata.distnorm.values)
+            ri_obs = pm.Data("RI", self.ridata.RI.values)
 
             # parameters and error
             psi_mean = pm.Normal('𝜓_mean', mu=0., sigma=10., shape=1)
@@ -32,16 +34,16 @@ class LogisticPooled(BaseLogisticModel):
             beta = pm.Normal('𝛽', mu=0., sigma=10., shape=1)
             
             # linear model prediction
-            logit = pm.invlogit(
+            logit = pm.math.invlogit(
                 self.function(
                     velocity=(beta + psi_spp[sidx0] + psi_spp[sidx1]),
-                    distance=self.ridata.distnorm,
+                    distance=distnorm,
                     intercept=0,
                 )
             )
             
             # data likelihood (normal distributed errors)
-            pm.Bernoulli("y", p=logit, observed=self.ridata.RI)
+            pm.Bernoulli("y", p=logit, observed=ri_obs)
   
 
 
@@ -11,12 +11,14 @@ import toyplot
 import toyplot.html, toyplot.png, toyplot.browser
 
 
-def dist_RI_scatterplot(ridata, outdir="/tmp", jitter=0.01):
+def dist_RI_scatterplot(ridata, outdir="/tmp", jitter=0.01, seed=None):
     """
     Scatterplot of RI values x genetic dist with the 
     genetic distance values jittered slightly to show
     more clearly despite overlap.
     """
+    # random generator for jitter
+    rng = np.random.default_rng(seed)
 
     # get canvas and axes
     canvas = toyplot.Canvas(width=300, height=250)
@@ -27,10 +29,9 @@ def dist_RI_scatterplot(ridata, outdir="/tmp", jitter=0.01):
     )
 
     # jitter points w/ RI=0 to increase visibiliby (constrain in 0-1)
-    xdata = ridata.dist[ridata.RI == 0]
-    xdata += np.random.uniform(-jitter, jitter, size=xdata.size)
-    xdata[xdata > 1] = 1
-    xdata[xdata < 0] = 0    
+    xdata = ridata.dist[ridata.RI == 0].to_numpy(copy=True)
+    xdata += rng.uniform(-jitter, jitter, size=xdata.size)
+    np.clip(xdata, 0., 1., out=xdata)
     mark = axes.scatterplot(
         xdata,
         ridata.RI[ridata.RI == 0],
@@ -44,10 +45,9 @@ def dist_RI_scatterplot(ridata, outdir="/tmp", jitter=0.01):
     )
 
     # jitter points w/ RI=1 to increase visibiliby (constrain in 0-1)    
-    xdata = ridata.dist[ridata.RI == 1]
-    xdata += np.random.uniform(-jitter, jitter, size=xdata.size)
-    xdata[xdata > 1] = 1
-    xdata[xdata < 0] = 0    
+    xdata = ridata.dist[ridata.RI == 1].to_numpy(copy=True)
+    xdata += rng.uniform(-jitter, jitter, size=xdata.size)
+    np.clip(xdata, 0., 1., out=xdata)
     mark = axes.scatterplot(
         xdata,
         ridata.RI[ridata.RI == 1],
@@ -102,45 +102,21 @@ def heatmap_tree_plot(tree, clades, ridata, **kwargs):
         "stroke": "none"
     }
 
-    # set values for data
-    for idx in ridata.index:
-
-        # get the tip indices
-        ridx, cidx = map(int, ridata.loc[idx, ['sidx0', 'sidx1']])
-
-        # row indexing starts from the bottom, not the top, so flip
-        rridx = tree.ntips - ridx - 1
-        ccidx = tree.ntips - cidx - 1
-
-        # convert all indexers to ints
-        ridx, cidx, rridx, ccidx = map(int, [ridx, cidx, rridx, ccidx])
-
-        # get RI for this cell
-        value = ridata.at[idx, 'RI']
-        if value:
-            color = "red"
-        if not value:
-            color = "black"
-
-        # fill color for observation on both sides of diagonal
-        ax1.cells.cell[rridx, cidx].style = {
-            "fill": color,
-            "stroke": "none"
-        }
-        # ax1.cells.cell[cidx, ridx].style = {
-        #     "fill": color,
-        #     "stroke": "none"
-        # }
-
-        # # fill hover for observation on both sides of diagonal        
-        # hover = (
-        #     "{} x {}; logit={:.3f}".format(
-        #         tree.idx_dict[ridx].name,
-        #         tree.idx_dict[ccidx].name,
-        #         logit,
-        #     ))
-        # ax1.cells.cell[ccidx, ridx].title = hover
-        # ax1.cells.cell[ridx, ccidx].title = hover        
+    # get the tip indices of each observation as int arrays. Row 
+    # indexing starts from the bottom, not the top, so flip rows.
+    rows = tree.ntips - ridata['sidx0'].to_numpy().astype(np.intp) - 1
+    cols = ridata['sidx1'].to_numpy().astype(np.intp)
+    hybrid = ridata['RI'].to_numpy().astype(bool)
+
+    # fill color for observations by RI value (red=1, black=0)
+    ax1.cells.cell[rows[hybrid], cols[hybrid]].style = {
+        "fill": "red",
+        "stroke": "none"
+    }
+    ax1.cells.cell[rows[~hybrid], cols[~hybrid]].style = {
+        "fill": "black",
+        "stroke": "none"
+    }
 
     # dividers
     ax1.body.gaps.columns[...] = 0.